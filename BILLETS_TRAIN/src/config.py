@@ -2,18 +2,36 @@
 Configuration et constantes pour le gestionnaire de billets de train
 """
 
-# Gares valides reconnues par le système
-GARES_VALIDES = {
+import sys
+
+# Gares valides reconnues par le système (noms internés, ensemble immuable)
+GARES_VALIDES = frozenset(sys.intern(gare) for gare in (
     'ANGERS', 'BORDEAUX', 'CAEN', 'CHAMBERY', 'GRENOBLE',
     'LA_ROCHELLE', 'LILLE', 'LYON', 'MARSEILLE', 'NANTES',
     'PARIS', 'RENNES', 'STRASBOURG', 'TOULOUSE', 'VALENCE', 'POITIERS'
-}
+))
+
+# Colonnes du CSV contenant les références de billets
+COLONNES_REFERENCES = ('Aller 1', 'Aller 2', 'Retour 1', 'Retour 2')
+
+# Colonnes des types de billets et libellé du trajet correspondant
+COLONNES_TYPES_BILLET = (('Type de billet 19 juin', 'Aller'), ('Type de billet 21', 'Retour'))
+
+# Colonnes lues dans le CSV en plus des trois premières (ID, Nom, Prénom)
+COLONNES_UTILES = frozenset(COLONNES_REFERENCES) | {col for col, _ in COLONNES_TYPES_BILLET}
 
 # Configuration par défaut
 CHEMIN_CSV_DEFAUT = 'data.csv'
 REPERTOIRE_PDF_DEFAUT = 'BILLETS_PDF'
 REPERTOIRE_SORTIE_DEFAUT = 'OUTPUT'
 
+# Fusion des PDFs en parallèle (None = nombre de processeurs)
+NB_PROCESSUS_FUSION = None
+
+# Dédoublonnage des objets identiques dans les PDFs fusionnés :
+# fichiers ~15% plus légers mais fusion ~50% plus lente
+DEDOUBLONNER_OBJETS_PDF = False
+
 # Fichiers de sortie
 FICHIER_STATS = 'statistiques_repartition.txt'
 FICHIER_REFS_NON_ATTRIBUEES = 'references_non_attribuees.csv'
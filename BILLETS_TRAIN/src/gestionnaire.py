@@ -2,21 +2,61 @@
 Classe principale pour la gestion des billets de train
 """
 
-import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from collections import Counter, defaultdict
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import numpy as np
+    import pandas as pd
+    from pypdf import PdfWriter
+except ImportError as e:
+    raise ImportError(
+        f"Dépendance manquante : {e.name}. Installez-la avec `pip install -r requirements.txt`"
+    ) from e
 
 from .config import (
     CHEMIN_CSV_DEFAUT, REPERTOIRE_PDF_DEFAUT, REPERTOIRE_SORTIE_DEFAUT,
     FICHIER_STATS, FICHIER_REFS_NON_ATTRIBUEES,
-    GARES_VALIDES, SEUIL_AFFICHAGE_POURCENTAGE
+    GARES_VALIDES, COLONNES_REFERENCES, COLONNES_TYPES_BILLET, COLONNES_UTILES,
+    SEUIL_AFFICHAGE_POURCENTAGE, NB_PROCESSUS_FUSION, DEDOUBLONNER_OBJETS_PDF
 )
 from .utils import (
-    installer_si_necessaire, nettoyer_reference, extraire_gare_depart,
-    extraire_gare_arrivee, est_reference_valide, formater_pourcentage
+    nettoyer_reference, extraire_gare_depart,
+    extraire_gare_arrivee, est_reference_valide, formater_pourcentage,
+    MOTIF_REFERENCE
 )
 
+# Les gares extraites sont stockées en catégories (codes entiers) : comparaisons
+# et comptages se font sur les codes plutôt que sur des chaînes
+TYPE_GARE = pd.CategoricalDtype(sorted(GARES_VALIDES))
+
+
+def _fusionner_fichiers_pdf(chemins_pdf: List[Path], chemin_sortie: Path, libelle: str) -> bool:
+    """Fusionne une liste de PDFs dans un fichier (fonction de module pour ProcessPoolExecutor)"""
+    try:
+        writer = PdfWriter()
+        for chemin_pdf in chemins_pdf:
+            try:
+                # append copie le document d'un bloc, sans boucle page par page
+                writer.append(chemin_pdf, import_outline=False)
+            except Exception as e:
+                print(f"Erreur PDF {chemin_pdf}: {e}")
+                continue
+        
+        if DEDOUBLONNER_OBJETS_PDF:
+            # Dédoublonne les polices/images communes aux billets fusionnés
+            writer.compress_identical_objects()
+        # Tampon de 1 Mio : le PDF fusionné est écrit en quelques appels système
+        with open(chemin_sortie, "wb", buffering=1 << 20) as f:
+            writer.write(f)
+        return True
+        
+    except Exception as e:
+        print(f"Erreur fusion {libelle}: {e}")
+        return False
+
 
 class GestionnaireBillets:
     """Classe principale pour gérer les billets et générer les analyses"""
@@ -30,44 +70,45 @@ class GestionnaireBillets:
         self.repertoire_sortie = Path(repertoire_sortie)
         self.repertoire_sortie.mkdir(exist_ok=True)
         
-        # Installation et import des dépendances
-        installer_si_necessaire('pandas')
-        installer_si_necessaire('pypdf')
-        
-        import pandas as pd
-        from pypdf import PdfWriter, PdfReader
-        
-        self.pd = pd
-        self.PdfWriter = PdfWriter
-        self.PdfReader = PdfReader
-        
         self.df = None
-        self.stats_contenu = []
+        self._col_idx = {}
+        self._ref_cols = []
+        self._refs = None
+        self._pdf_disponibles = None
+        self._fichier_stats = None
     
     def log_stat(self, texte: str = '') -> None:
-        """Ajoute une ligne aux statistiques"""
+        """Affiche une ligne de statistiques et l'écrit directement dans le fichier"""
         print(texte)
-        self.stats_contenu.append(texte)
+        if self._fichier_stats is not None:
+            self._fichier_stats.write(texte + '\n')
     
     def charger_donnees(self) -> None:
         """Charge les données depuis le CSV"""
-        self.df = self.pd.read_csv(self.chemin_csv)
+        # Seules les colonnes ID/Nom/Prénom (3 premières) et celles utilisées sont lues
+        entete = pd.read_csv(self.chemin_csv, nrows=0).columns
+        colonnes = [c for i, c in enumerate(entete) if i < 3 or c in COLONNES_UTILES]
+        # Toutes les colonnes lues sont textuelles : le moteur C respecte dtype=str
+        # (pyarrow infère quand même des entiers et perd les zéros initiaux)
+        self.df = pd.read_csv(self.chemin_csv, usecols=colonnes, dtype=str, engine='c')
+        # Références normalisées une fois : chaînes, '--' si vide ou colonne absente
+        for col in COLONNES_REFERENCES:
+            self.df[col] = self.df[col].fillna('--').astype(str) if col in self.df.columns else '--'
+        # Index des colonnes résolu une fois : accès par position (itertuples)
+        # et test de présence en O(1) à la place de `col in self.df.columns`
+        self._col_idx = {c: i for i, c in enumerate(self.df.columns)}
+        self._ref_cols = [self._col_idx[c] for c in COLONNES_REFERENCES]
+        # Matrice des références (une ligne par personne), extraite une seule fois
+        self._refs = self.df[list(COLONNES_REFERENCES)].to_numpy(dtype=object)
     
-    def extraire_references_personne(self, row) -> List[str]:
-        """Extrait les références d'une personne"""
-        refs = []
-        for col in ['Aller 1', 'Aller 2', 'Retour 1', 'Retour 2']:
-            if col in self.df.columns:
-                val = row[col]
-                refs.append('--' if self.pd.isna(val) else str(val))
-            else:
-                refs.append('--')
-        return refs
+    def extraire_references_personne(self, row: tuple) -> List[str]:
+        """Extrait les références d'une personne (ligne issue de itertuples)"""
+        return [row[i] for i in self._ref_cols]
     
     def analyser_trajet(self, ref1: str, ref2: str) -> Dict[str, Any]:
         """Analyse un trajet (aller ou retour)"""
-        if self.pd.isna(ref1): ref1 = '--'
-        if self.pd.isna(ref2): ref2 = '--'
+        if pd.isna(ref1): ref1 = '--'
+        if pd.isna(ref2): ref2 = '--'
         ref1, ref2 = str(ref1), str(ref2)
         
         if not est_reference_valide(ref1):
@@ -90,75 +131,141 @@ class GestionnaireBillets:
                 'est_direct': True
             }
     
-    def fusionner_pdfs_personne(self, nom: str, prenom: str, id_personne: str, refs: List[str]) -> bool:
-        """Fusionne les PDFs de billets pour une personne"""
+    def _extraire_gares_series(self, refs: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """Version vectorisée de extraire_gare_depart / extraire_gare_arrivee"""
+        # Préfixe GARE1-GARE2 avant le premier '_' (cf. nettoyer_reference)
+        gares_tete = refs.str.extract(MOTIF_REFERENCE)
+        prefixe_valide = gares_tete[0].notna()
+        
+        # Sinon découpage de la référence brute
+        parts = refs.str.split('-', n=2, expand=True).reindex(columns=[0, 1])
+        depart = parts[0].where(parts[1].notna() & parts[0].isin(GARES_VALIDES))
+        arrivee = parts[1].where(parts[1].isin(GARES_VALIDES))
+        
+        return (gares_tete[0].where(prefixe_valide, depart),
+                gares_tete[1].where(prefixe_valide, arrivee))
+    
+    def _analyser_trajets_series(self, refs1: pd.Series, refs2: pd.Series) -> pd.DataFrame:
+        """Version vectorisée de analyser_trajet sur des colonnes de références"""
+        valide1 = refs1.str.strip() != '--'
+        valide2 = refs2.str.strip() != '--'
+        depart1, arrivee1 = self._extraire_gares_series(refs1)
+        _, arrivee2 = self._extraire_gares_series(refs2)
+        
+        est_direct = ~valide1 | ~valide2
+        return pd.DataFrame({
+            'gare_depart': depart1.where(valide1).astype(TYPE_GARE),
+            'gare_arrivee': arrivee1.where(est_direct, arrivee2).where(valide1).astype(TYPE_GARE),
+            'est_direct': est_direct,
+        })
+    
+    @staticmethod
+    def _lister_pdf(dossier: Path) -> List[str]:
+        """Noms (sans extension) des PDFs d'un dossier, sans construire de Path"""
+        # Mêmes entrées que glob('*.pdf'), fichiers cachés compris
+        with os.scandir(dossier) as entrees:
+            return [entree.name[:-4] for entree in entrees if entree.name.endswith('.pdf')]
+    
+    def _lister_pdf_disponibles(self) -> set:
+        """Références des PDFs disponibles (un seul parcours du répertoire, partagé)"""
+        if self._pdf_disponibles is None:
+            self._pdf_disponibles = set(self._lister_pdf(self.repertoire_pdf))
+        return self._pdf_disponibles
+    
+    def _preparer_fusion(self, nom: str, prenom: str, refs: List[str]) -> Optional[List[Path]]:
+        """Retourne les chemins des PDFs à fusionner pour une personne (None si impossible)"""
         refs_valides = [ref for ref in refs if est_reference_valide(ref)]
         if not refs_valides:
-            return False
+            return None
         
-        chemins_pdf = [self.repertoire_pdf / f"{ref}.pdf" for ref in refs_valides]
-        manquants = [ref for ref, chemin in zip(refs_valides, chemins_pdf) if not chemin.is_file()]
+        pdf_disponibles = self._lister_pdf_disponibles()
+        manquants = [ref for ref in refs_valides if ref not in pdf_disponibles]
         
         if manquants:
             print(f"PDF manquants pour {nom} {prenom} : {', '.join(manquants)}")
-            return False
+            return None
         
-        try:
-            writer = self.PdfWriter()
-            for chemin_pdf in chemins_pdf:
-                try:
-                    with open(chemin_pdf, "rb") as f:
-                        reader = self.PdfReader(f)
-                        for page in reader.pages:
-                            writer.add_page(page)
-                except Exception as e:
-                    print(f"Erreur PDF {chemin_pdf}: {e}")
-                    continue
-            
-            nom_fichier = f"{nom}_{prenom}_{id_personne}.pdf"
-            with open(self.repertoire_sortie / nom_fichier, "wb") as f:
-                writer.write(f)
-            return True
-            
-        except Exception as e:
-            print(f"Erreur fusion {nom} {prenom}: {e}")
+        return [self.repertoire_pdf / f"{ref}.pdf" for ref in refs_valides]
+    
+    def _chemin_sortie(self, nom: str, prenom: str, id_personne: str) -> Path:
+        """Chemin du PDF fusionné d'une personne"""
+        return self.repertoire_sortie / f"{nom}_{prenom}_{id_personne}.pdf"
+    
+    def fusionner_pdfs_personne(self, nom: str, prenom: str, id_personne: str, refs: List[str]) -> bool:
+        """Fusionne les PDFs de billets pour une personne"""
+        chemins_pdf = self._preparer_fusion(nom, prenom, refs)
+        if chemins_pdf is None:
             return False
+        return _fusionner_fichiers_pdf(chemins_pdf, self._chemin_sortie(nom, prenom, id_personne), f"{nom} {prenom}")
+    
+    def fusionner_tous_les_pdfs(self) -> int:
+        """Fusionne les PDFs de toutes les personnes en parallèle, retourne le nombre de fusions"""
+        # Normalisation des noms sur toute la colonne. fillna('nan') reproduit volontairement
+        # str(NaN) de l'ancien code : une cellule vide garde son nom de sortie (NAN_NAN_...pdf)
+        ids = self.df.iloc[:, 0].fillna('nan')
+        noms = self.df.iloc[:, 1].fillna('nan').str.upper().str.replace(' ', '', regex=False)
+        prenoms = self.df.iloc[:, 2].fillna('nan').str.upper().str.replace(' ', '', regex=False)
+        
+        taches = []
+        # tolist() convertit toute la matrice en listes d'un seul appel
+        for id_personne, nom, prenom, refs in zip(ids, noms, prenoms, self._refs.tolist()):
+            chemins_pdf = self._preparer_fusion(nom, prenom, refs)
+            if chemins_pdf is not None:
+                taches.append((chemins_pdf, self._chemin_sortie(nom, prenom, id_personne), f"{nom} {prenom}"))
+        
+        nb_processus = min(NB_PROCESSUS_FUSION or os.cpu_count() or 1, len(taches))
+        if nb_processus <= 1:
+            # Un seul processus utile : pas de coût de création du pool
+            return sum(_fusionner_fichiers_pdf(*tache) for tache in taches)
+        with ProcessPoolExecutor(max_workers=nb_processus) as executor:
+            resultats = list(executor.map(_fusionner_fichiers_pdf, *zip(*taches), chunksize=16))
+        return sum(resultats)
+    
+    def _raison_non_attribution(self, ref: str) -> Optional[str]:
+        """Retourne la raison pour laquelle une référence PDF n'est pas attribuée"""
+        ref_propre = nettoyer_reference(ref)
+        if '_' in ref_propre and '-' in ref_propre:
+            gares = ref_propre.split('-')
+            if len(gares) != 2 or not all(g in GARES_VALIDES for g in gares):
+                return "Format invalide"
+            return None
+        return "Pas de référence dans le CSV"
     
     def detecter_billets_non_utilises(self) -> int:
         """Détecte les billets non attribués et sauvegarde en CSV"""
-        refs_attribuees = set()
-        for _, row in self.df.iterrows():
-            for ref in self.extraire_references_personne(row):
-                if est_reference_valide(ref):
-                    refs_attribuees.add(ref)
+        # Les quatre colonnes à plat, filtrées par un masque unique (références valides)
+        refs = self._refs.ravel()
+        refs_attribuees = set(refs[refs != '--'].tolist())
         
-        refs_non_attribuees = []
-        for pdf_file in self.repertoire_pdf.glob('*.pdf'):
-            ref = pdf_file.stem
-            if ref not in refs_attribuees:
-                ref_propre = nettoyer_reference(ref)
-                if '_' in ref_propre and '-' in ref_propre:
-                    gares = ref_propre.split('-')
-                    if len(gares) != 2 or not all(g in GARES_VALIDES for g in gares):
-                        refs_non_attribuees.append([ref, "Format invalide"])
-                else:
-                    refs_non_attribuees.append([ref, "Pas de référence dans le CSV"])
+        refs_non_attribuees = [
+            [ref, raison] for ref in sorted(self._lister_pdf_disponibles() - refs_attribuees)
+            if (raison := self._raison_non_attribution(ref))
+        ]
         
         if refs_non_attribuees:
-            with open(FICHIER_REFS_NON_ATTRIBUEES, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Reference', 'Raison'])
-                writer.writerows(refs_non_attribuees)
+            # lineterminator identique à csv.writer pour garder le même fichier
+            pd.DataFrame(refs_non_attribuees, columns=['Reference', 'Raison']).to_csv(
+                FICHIER_REFS_NON_ATTRIBUEES, index=False, encoding='utf-8', lineterminator='\r\n'
+            )
         
         return len(refs_non_attribuees)
     
     def generer_toutes_les_statistiques(self) -> None:
-        """Génère toutes les statistiques"""
+        """Génère toutes les statistiques (écrites au fil de l'eau dans FICHIER_STATS)"""
+        self._fichier_stats = open(FICHIER_STATS, 'w', encoding='utf-8', buffering=1 << 16)
+        try:
+            self._generer_statistiques()
+        finally:
+            self._fichier_stats.close()
+            self._fichier_stats = None
+    
+    def _generer_statistiques(self) -> None:
+        """Calcule et affiche les statistiques via log_stat"""
         self.log_stat('=== STATISTIQUES DE RÉPARTITION ===')
         
         # Statistiques des fichiers
-        nb_pdf_source = len(list(self.repertoire_pdf.glob('*.pdf')))
-        nb_pdf_fusionnes = len(list(self.repertoire_sortie.glob('*.pdf')))
+        nb_pdf_source = len(self._lister_pdf_disponibles())
+        nb_pdf_fusionnes = len(self._lister_pdf(self.repertoire_sortie))
         self.log_stat(f"\nNombre de PDF dans {self.repertoire_pdf.name} : {nb_pdf_source}")
         self.log_stat(f"Nombre de billets fusionnés dans {self.repertoire_sortie.name} : {nb_pdf_fusionnes}")
         
@@ -168,45 +275,34 @@ class GestionnaireBillets:
             self.log_stat(f"\nNombre de références non attribuées : {nb_non_utilises}")
             self.log_stat(f"Détails sauvegardés dans '{FICHIER_REFS_NON_ATTRIBUEES}'")
         
-        # Analyse des trajets
-        stats_trajets = {'aller_direct': 0, 'aller_escale': 0, 'retour_direct': 0, 'retour_escale': 0}
-        gares_depart = []
-        gares_arrivee_aller = []
-        gares_arrivee_retour = []
-        trajets_symetriques = []
+        # Analyse des trajets (vectorisée sur toutes les lignes)
+        aller = self._analyser_trajets_series(self.df['Aller 1'], self.df['Aller 2'])
+        retour = self._analyser_trajets_series(self.df['Retour 1'], self.df['Retour 2'])
         
-        for _, row in self.df.iterrows():
-            refs = self.extraire_references_personne(row)
-            
-            # Analyse aller et retour
-            aller = self.analyser_trajet(refs[0], refs[1])
-            retour = self.analyser_trajet(refs[2], refs[3])
-            
-            # Stats aller
-            if aller['gare_depart']:
-                gares_depart.append(aller['gare_depart'])
-                if aller['est_direct']:
-                    stats_trajets['aller_direct'] += 1
-                else:
-                    stats_trajets['aller_escale'] += 1
-                if aller['gare_arrivee']:
-                    gares_arrivee_aller.append(aller['gare_arrivee'])
-            
-            # Stats retour
-            if retour['gare_depart']:
-                if retour['est_direct']:
-                    stats_trajets['retour_direct'] += 1
-                else:
-                    stats_trajets['retour_escale'] += 1
-                if retour['gare_arrivee']:
-                    gares_arrivee_retour.append(retour['gare_arrivee'])
-            
-            # Trajets symétriques
-            if (aller['gare_depart'] and aller['gare_arrivee'] and 
-                retour['gare_depart'] and retour['gare_arrivee'] and
-                aller['gare_depart'] == retour['gare_arrivee'] and 
-                aller['gare_arrivee'] == retour['gare_depart']):
-                trajets_symetriques.append(f"{aller['gare_depart']}-{aller['gare_arrivee']}")
+        # Codes des catégories de gares (-1 = pas de gare)
+        dep_a = aller['gare_depart'].cat.codes.to_numpy()
+        arr_a = aller['gare_arrivee'].cat.codes.to_numpy()
+        dep_r = retour['gare_depart'].cat.codes.to_numpy()
+        arr_r = retour['gare_arrivee'].cat.codes.to_numpy()
+        aller_part = dep_a >= 0
+        retour_part = dep_r >= 0
+        
+        # Clé sur 2 bits : bit 1 = retour, bit 0 = escale
+        escale_a = ~aller['est_direct'].to_numpy()
+        escale_r = ~retour['est_direct'].to_numpy()
+        cles = np.concatenate([escale_a[aller_part].astype(np.uint8),
+                               escale_r[retour_part].astype(np.uint8) | 2])
+        comptes = np.bincount(cles, minlength=4)
+        stats_trajets = dict(zip(('aller_direct', 'aller_escale', 'retour_direct', 'retour_escale'),
+                                 map(int, comptes)))
+        gares_depart = aller['gare_depart'][aller_part]
+        gares_arrivee_aller = aller['gare_arrivee'][aller_part & (arr_a >= 0)]
+        gares_arrivee_retour = retour['gare_arrivee'][retour_part & (arr_r >= 0)]
+        
+        # Trajets symétriques : égalité des codes, sans branchement par ligne
+        masque_symetrique = (dep_a == arr_r) & (arr_a == dep_r) & aller_part & (arr_a >= 0)
+        trajets_symetriques = (aller['gare_depart'][masque_symetrique].astype(str) + '-' +
+                               aller['gare_arrivee'][masque_symetrique].astype(str))
         
         # Affichage des statistiques
         self._afficher_statistiques_gares_depart(gares_depart)
@@ -214,23 +310,25 @@ class GestionnaireBillets:
         self._afficher_statistiques_trajets(stats_trajets)
         self._afficher_statistiques_gares_arrivee(gares_arrivee_aller, gares_arrivee_retour)
         self._afficher_trajets_symetriques(trajets_symetriques)
-        
-        # Sauvegarde
-        with open(FICHIER_STATS, 'w', encoding='utf-8') as f:
-            for ligne in self.stats_contenu:
-                f.write(ligne + '\n')
     
-    def _afficher_statistiques_gares_depart(self, gares_depart: List[str]) -> None:
+    @staticmethod
+    def _compter(valeurs: pd.Series) -> pd.Series:
+        """Comptage décroissant, ex-aequo dans l'ordre d'apparition (comme Counter.most_common)"""
+        # reindex : ordre de première apparition, et pas de catégories absentes
+        comptes = valeurs.value_counts(sort=False).reindex(valeurs.drop_duplicates().tolist())
+        return comptes.sort_values(ascending=False, kind='stable')
+    
+    def _afficher_statistiques_gares_depart(self, gares_depart: pd.Series) -> None:
         """Affiche les statistiques des gares de départ"""
-        if gares_depart:
+        if not gares_depart.empty:
             self.log_stat('\nRépartition par gare de départ :')
-            for gare, count in Counter(gares_depart).most_common():
+            for gare, count in self._compter(gares_depart).items():
                 self.log_stat(f"  {gare} : {formater_pourcentage(count, len(gares_depart))}")
     
     def _afficher_statistiques_types_billets(self) -> None:
         """Affiche les statistiques des types de billets"""
-        for col, nom in [('Type de billet 19 juin', 'Aller'), ('Type de billet 21', 'Retour')]:
-            if col in self.df.columns:
+        for col, nom in COLONNES_TYPES_BILLET:
+            if col in self._col_idx:
                 types = self.df[col].value_counts()
                 self.log_stat(f'\nRépartition par type de billet ({nom}) :')
                 for typ, count in types.items():
@@ -249,23 +347,23 @@ class GestionnaireBillets:
             self.log_stat(f"Trajets retour directs : {formater_pourcentage(stats_trajets['retour_direct'], total_retour)}")
             self.log_stat(f"Trajets retour avec escale : {formater_pourcentage(stats_trajets['retour_escale'], total_retour)}")
     
-    def _afficher_statistiques_gares_arrivee(self, gares_arrivee_aller: List[str], gares_arrivee_retour: List[str]) -> None:
+    def _afficher_statistiques_gares_arrivee(self, gares_arrivee_aller: pd.Series, gares_arrivee_retour: pd.Series) -> None:
         """Affiche les statistiques des gares d'arrivée"""
         for gares, titre in [(gares_arrivee_aller, "aller"), (gares_arrivee_retour, "retour")]:
-            if gares:
+            if not gares.empty:
                 self.log_stat(f"\nRépartition des gares d'arrivée ({titre}) :")
-                for gare, count in Counter(gares).most_common():
-                    if count / len(gares) > SEUIL_AFFICHAGE_POURCENTAGE:  # Seuil 5%
-                        self.log_stat(f"  {gare} : {formater_pourcentage(count, len(gares))}")
+                comptes = self._compter(gares)
+                for gare, count in comptes[comptes / len(gares) > SEUIL_AFFICHAGE_POURCENTAGE].items():
+                    self.log_stat(f"  {gare} : {formater_pourcentage(count, len(gares))}")
     
-    def _afficher_trajets_symetriques(self, trajets_symetriques: List[str]) -> None:
+    def _afficher_trajets_symetriques(self, trajets_symetriques: pd.Series) -> None:
         """Affiche les trajets symétriques"""
-        if trajets_symetriques:
+        if not trajets_symetriques.empty:
             self.log_stat('\n=== TRAJETS SYMÉTRIQUES ===')
             self.log_stat('\nTrajets symétriques les plus fréquents :')
-            for trajet, count in Counter(trajets_symetriques).most_common():
-                if count / len(trajets_symetriques) > SEUIL_AFFICHAGE_POURCENTAGE:
-                    self.log_stat(f"  {trajet} : {formater_pourcentage(count, len(trajets_symetriques))}")
+            comptes = self._compter(trajets_symetriques)
+            for trajet, count in comptes[comptes / len(trajets_symetriques) > SEUIL_AFFICHAGE_POURCENTAGE].items():
+                self.log_stat(f"  {trajet} : {formater_pourcentage(count, len(trajets_symetriques))}")
     
     def executer_analyse_complete(self) -> None:
         """Exécute l'analyse complète"""
@@ -273,12 +371,7 @@ class GestionnaireBillets:
         self.charger_donnees()
         
         print("Fusion des PDFs...")
-        for _, row in self.df.iterrows():
-            nom = str(row.iloc[1]).upper().replace(' ', '')
-            prenom = str(row.iloc[2]).upper().replace(' ', '')
-            id_personne = str(row.iloc[0])
-            refs = self.extraire_references_personne(row)
-            self.fusionner_pdfs_personne(nom, prenom, id_personne, refs)
+        self.fusionner_tous_les_pdfs()
         
         print("Génération des statistiques...")
         self.generer_toutes_les_statistiques()
@@ -2,60 +2,54 @@
 Fonctions utilitaires pour le traitement des références de billets
 """
 
+import re
 import sys
-import subprocess
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from .config import GARES_VALIDES
 
 
-def installer_si_necessaire(package: str) -> None:
-    """Installe un package Python s'il n'est pas présent"""
-    try:
-        __import__(package)
-    except ImportError:
-        print(f"Installation du package manquant : {package}")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+# GARE1-GARE2 suivi de '_' ou de la fin de chaîne (\Z : pas de '\n' final accepté) :
+# équivaut à tester le préfixe avant le premier '_', d'où l'exclusion des gares
+# contenant '_' (LA_ROCHELLE)
+_GARES_MOTIF = '|'.join(map(re.escape, sorted(g for g in GARES_VALIDES if '_' not in g)))
+MOTIF_REFERENCE = re.compile(rf"^({_GARES_MOTIF})-({_GARES_MOTIF})(?:_|\Z)")
 
 
 def nettoyer_reference(ref: str) -> str:
     """Nettoie une référence : GARE1-GARE2_INFOS -> GARE1-GARE2"""
     if not isinstance(ref, str) or ref == '--':
         return ref
-    if '_' in ref:
-        partie_gares = ref.split('_')[0]
-        if '-' in partie_gares:
-            gares = partie_gares.split('-')
-            if len(gares) == 2 and all(g in GARES_VALIDES for g in gares):
-                return partie_gares
-    elif '-' in ref:
-        gares = ref.split('-')
-        if len(gares) == 2 and all(g in GARES_VALIDES for g in gares):
-            return ref
-    return ref
+    m = MOTIF_REFERENCE.match(ref)
+    return f"{m.group(1)}-{m.group(2)}" if m else ref
+
+
+@lru_cache(maxsize=None)
+def _parse_ref(ref: str) -> Tuple[Optional[str], Optional[str]]:
+    """Analyse une référence une seule fois : retourne (gare_depart, gare_arrivee)"""
+    m = MOTIF_REFERENCE.match(ref)
+    if m:
+        return sys.intern(m.group(1)), sys.intern(m.group(2))
+    if '-' not in ref:
+        return None, None
+    # Référence non nettoyable : on découpe la référence brute
+    parts = ref.split('-')
+    return (sys.intern(parts[0]) if parts[0] in GARES_VALIDES else None,
+            sys.intern(parts[1]) if parts[1] in GARES_VALIDES else None)
 
 
 def extraire_gare_depart(ref: str) -> Optional[str]:
     """Extrait la gare de départ d'une référence"""
     if not isinstance(ref, str) or ref == '--':
         return None
-    ref_propre = nettoyer_reference(ref)
-    if '-' in ref_propre:
-        gare = ref_propre.split('-')[0]
-        return gare if gare in GARES_VALIDES else None
-    return None
+    return _parse_ref(ref)[0]
 
 
 def extraire_gare_arrivee(ref: str) -> Optional[str]:
     """Extrait la gare d'arrivée d'une référence"""
     if not isinstance(ref, str) or ref == '--':
         return None
-    ref_propre = nettoyer_reference(ref)
-    if '-' in ref_propre:
-        parts = ref_propre.split('-')
-        if len(parts) >= 2:
-            gare = parts[1]
-            return gare if gare in GARES_VALIDES else None
-    return None
+    return _parse_ref(ref)[1]
 
 
 def est_reference_valide(ref: str) -> bool:
@@ -1,7 +1,6 @@
+import numpy as np
 import pandas as pd
-import random
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from typing import List, Set, Tuple
 
 # Configuration
 SEED = 42
@@ -14,25 +13,53 @@ class TeamAllocator:
         """Initialise l'allocateur d'équipes avec le chemin du fichier CSV."""
         self.csv_path = csv_path
         self.df = pd.read_csv(csv_path)
+        # Index Id -> position et colonnes extraites une fois : accès en O(1)
+        # au lieu d'un filtrage self.df[self.df['Id'] == ...] à chaque appel
+        self.id_to_idx = {id_: i for i, id_ in enumerate(self.df['Id'].to_numpy())}
+        # Divisions stockées en catégories : codes entiers (-1 = pas de division)
+        # pour la matrice équipes x divisions
+        self.df['Division'] = self.df['Division'].astype('category')
+        self.division_codes = self.df['Division'].cat.codes.to_numpy()
+        self.n_divisions = len(self.df['Division'].cat.categories)
+        self.is_comp_arr = self.df['IsCompagnons'].to_numpy() == 'OUI'
+        self.has_guest_arr = self.df['GuestId'].notna().to_numpy()
         self.pairs = self._build_invitation_pairs()
+        # Positions des inviteurs et des invités, dans l'ordre de self.pairs
+        self.pair_inviter_idxs = np.array([self.id_to_idx[inviter] for inviter, _ in self.pairs], dtype=np.int64)
+        self.pair_guest_idxs = np.array([self.id_to_idx[guest] for _, guest in self.pairs], dtype=np.int64)
         self.divisions = self._get_divisions()
-        random.seed(SEED)
+        # Noms et tailles limites des équipes calculés une fois
+        self.team_names = [self._get_team_name(team_idx) for team_idx in range(TOTAL_TEAMS)]
+        self.size_limits = np.where(np.arange(TOTAL_TEAMS) < TEAM_SIZE_8, 8, 7)
+        self.rng = np.random.default_rng(SEED)
         
     def _build_invitation_pairs(self) -> List[Tuple[str, str]]:
         """Construit les paires inviteur-invité."""
-        pairs = []
-        for _, row in self.df.iterrows():
-            if pd.notna(row['GuestId']):
-                pairs.append((row['Id'], row['GuestId']))
-        return pairs
+        mask = self.has_guest_arr
+        return list(zip(self.df['Id'].to_numpy()[mask], self.df['GuestId'].to_numpy()[mask]))
     
     def _get_divisions(self) -> Set[str]:
         """Récupère l'ensemble unique des divisions."""
         return set(self.df['Division'].dropna().unique())
     
-    def _initialize_teams(self) -> List[List[str]]:
-        """Initialise les équipes vides."""
-        return [[] for _ in range(TOTAL_TEAMS)]
+    def _initialize_teams(self) -> np.ndarray:
+        """Initialise les équipes vides et leurs compteurs, retourne l'équipe de chaque personne (-1 = aucune)."""
+        # Compteurs tenus à jour à chaque ajout, un élément par équipe : le score
+        # d'un candidat se calcule pour toutes les équipes à la fois
+        self.team_sizes = np.zeros(TOTAL_TEAMS, dtype=np.int64)
+        self.team_div_counts = np.zeros((TOTAL_TEAMS, self.n_divisions), dtype=np.int64)
+        self.team_compagnons = np.zeros(TOTAL_TEAMS, dtype=np.int64)
+        self.team_pairs = np.zeros(TOTAL_TEAMS, dtype=np.int64)
+        return np.full(len(self.df), -1, dtype=np.int16)
+    
+    def _add_to_team(self, team_of: np.ndarray, team_idx: int, person: int) -> None:
+        """Ajoute une personne à une équipe et met à jour les compteurs de l'équipe."""
+        team_of[person] = team_idx
+        self.team_sizes[team_idx] += 1
+        if self.division_codes[person] >= 0:
+            self.team_div_counts[team_idx, self.division_codes[person]] += 1
+        self.team_compagnons[team_idx] += self.is_comp_arr[person]
+        self.team_pairs[team_idx] += self.has_guest_arr[person]
     
     def _get_team_name(self, index: int) -> str:
         """Retourne le nom de l'équipe formaté (ex: Team_01, Team_02, etc.)."""
@@ -40,92 +67,134 @@ class TeamAllocator:
     
     def _get_team_size_limit(self, team_index: int) -> int:
         """Retourne la taille limite pour une équipe donnée."""
-        return 8 if team_index < TEAM_SIZE_8 else 7
+        return int(self.size_limits[team_index])
     
-    def _calculate_team_diversity_score(self, team: List[str], candidate_id: str) -> float:
-        """Calcule un score de diversité pour une équipe avec un candidat potentiel."""
-        if not team:  # Si l'équipe est vide, retourner un score neutre
-            return 0.0
-            
-        # Récupérer les informations du candidat
-        candidate_info = self.df[self.df['Id'] == candidate_id].iloc[0]
-        candidate_division = candidate_info['Division']
-        candidate_is_compagnon = candidate_info['IsCompagnons'] == 'OUI'
-        candidate_has_guest = pd.notna(candidate_info['GuestId'])
-        
-        # Récupérer les informations actuelles de l'équipe
-        team_info = self.df[self.df['Id'].isin(team)]
+    def _calculate_team_diversity_scores(self, candidate: int, team_sizes: np.ndarray,
+                                         team_compagnons: np.ndarray, team_pairs: np.ndarray,
+                                         extra_division: int = -1) -> np.ndarray:
+        """Calcule le score de diversité de chaque équipe avec un candidat potentiel.
         
+        extra_division : division d'une personne considérée comme déjà ajoutée aux équipes.
+        """
         # 1. Score basé sur la diversité des divisions
-        division_score = 0.0
-        if pd.notna(candidate_division):
-            existing_divisions = set(team_info['Division'].dropna())
-            if candidate_division not in existing_divisions:
-                division_score += 1.0
-                
+        division = self.division_codes[candidate]
+        if division >= 0 and division != extra_division:
+            division_score = (self.team_div_counts[:, division] == 0).astype(np.float64)
+        else:
+            division_score = np.zeros(TOTAL_TEAMS)
+        
         # 2. Score basé sur la mixité compagnons/non-compagnons
-        compagnon_score = 0.0
-        team_compagnons = (team_info['IsCompagnons'] == 'OUI').sum()
-        if candidate_is_compagnon and team_compagnons < len(team) / 2:
-            compagnon_score += 1.0
-        elif not candidate_is_compagnon and team_compagnons > len(team) / 2:
-            compagnon_score += 1.0
-
-        # 3. Score basé sur la répartition des paires inviteur-invité
-        pair_score = 0.0
-        team_pairs = sum(1 for _, row in team_info.iterrows() if pd.notna(row['GuestId']))
+        if self.is_comp_arr[candidate]:
+            compagnon_score = (team_compagnons < team_sizes / 2).astype(np.float64)
+        else:
+            compagnon_score = (team_compagnons > team_sizes / 2).astype(np.float64)
         
+        # 3. Score basé sur la répartition des paires inviteur-invité
         # Pénaliser les équipes qui ont déjà beaucoup de paires
-        if candidate_has_guest:
-            if team_pairs == 0:
-                pair_score += 2.0  # Bonus important pour une équipe sans paire
-            elif team_pairs == 1:
-                pair_score += 1.0  # Petit bonus pour une équipe avec une seule paire
-            else:
-                pair_score -= team_pairs * 0.5  # Pénalité croissante avec le nombre de paires
-            
-        return division_score + compagnon_score + pair_score
+        if self.has_guest_arr[candidate]:
+            pair_score = np.where(team_pairs == 0, 2.0,  # Bonus important pour une équipe sans paire
+                         np.where(team_pairs == 1, 1.0,  # Petit bonus pour une équipe avec une seule paire
+                                  -(team_pairs * 0.5)))  # Pénalité croissante avec le nombre de paires
+        else:
+            pair_score = np.zeros(TOTAL_TEAMS)
+        
+        # Si l'équipe est vide, score neutre
+        return np.where(team_sizes > 0, division_score + compagnon_score + pair_score, 0.0)
+    
+    def _refine_swaps(self, team_of: np.ndarray, max_passes: int = 10) -> int:
+        """Améliore l'allocation en échangeant des personnes seules entre équipes, retourne le nombre d'échanges.
+        
+        Objectif par équipe : nombre de divisions distinctes moins l'écart à la parité
+        compagnons/non-compagnons. Les membres des paires inviteur-invité ne sont pas
+        échangés, les tailles d'équipes et les quotas de paires sont donc conservés.
+        """
+        in_pair = np.zeros(len(self.df), dtype=np.bool_)
+        in_pair[self.pair_inviter_idxs] = True
+        in_pair[self.pair_guest_idxs] = True
+        singles = np.flatnonzero(~in_pair & (team_of >= 0))
+        single_divs = self.division_codes[singles]
+        single_divs_safe = np.where(single_divs >= 0, single_divs, 0)  # Index valide, masqué ensuite
+        single_comps = self.is_comp_arr[singles].astype(np.int64)
+        counts, compagnons, sizes = self.team_div_counts, self.team_compagnons, self.team_sizes
+        
+        nb_swaps = 0
+        for _ in range(max_passes):
+            improved = False
+            for k in range(len(singles)):
+                a, team_a = singles[k], team_of[singles[k]]
+                div_a, comp_a = single_divs[k], single_comps[k]
+                team_b = team_of[singles]
+                same_div = single_divs == div_a
+                
+                # Divisions distinctes : chaque équipe perd la division qui part si elle
+                # y était unique, et gagne celle qui arrive si elle en était absente
+                division_delta = np.zeros(len(singles))
+                if div_a >= 0:
+                    division_delta -= ~same_div & (counts[team_a, div_a] == 1)
+                    division_delta += ~same_div & (counts[team_b, div_a] == 0)
+                division_delta += (single_divs >= 0) & ~same_div & (counts[team_a, single_divs_safe] == 0)
+                division_delta -= (single_divs >= 0) & ~same_div & (counts[team_b, single_divs_safe] == 1)
+                
+                # Parité compagnons : écart |2 * compagnons - taille| / 2 avant et après
+                comp_change = single_comps - comp_a  # Variation pour l'équipe de a
+                balance_delta = (np.abs(2 * compagnons[team_a] - sizes[team_a])
+                                 - np.abs(2 * (compagnons[team_a] + comp_change) - sizes[team_a])
+                                 + np.abs(2 * compagnons[team_b] - sizes[team_b])
+                                 - np.abs(2 * (compagnons[team_b] - comp_change) - sizes[team_b])) / 2
+                
+                deltas = np.where(team_b != team_a, division_delta + balance_delta, 0.0)
+                best = int(np.argmax(deltas))
+                if deltas[best] <= 0:
+                    continue
+                
+                # Échange de a et b, mise à jour des compteurs des deux équipes
+                b, team_b = singles[best], team_b[best]
+                for person, old_team, new_team in ((a, team_a, team_b), (b, team_b, team_a)):
+                    if self.division_codes[person] >= 0:
+                        counts[old_team, self.division_codes[person]] -= 1
+                        counts[new_team, self.division_codes[person]] += 1
+                    compagnons[old_team] -= self.is_comp_arr[person]
+                    compagnons[new_team] += self.is_comp_arr[person]
+                    team_of[person] = new_team
+                nb_swaps += 1
+                improved = True
+            if not improved:
+                break
+        return nb_swaps
     
     def _calculate_team_stats(self) -> pd.DataFrame:
         """Calcule les statistiques par équipe."""
-        stats = []
         total_pairs = len(self.pairs)
         min_pairs_per_team = total_pairs // TOTAL_TEAMS
+        team_names = self.team_names
         
-        for team_idx in range(TOTAL_TEAMS):
-            team_name = self._get_team_name(team_idx)
-            team_members = self.df[self.df['Team'] == team_name]
-            
-            # Statistiques de base
-            total_members = len(team_members)
-            compagnons = len(team_members[team_members['IsCompagnons'] == 'OUI'])
-            
-            # Statistiques des divisions
-            divisions = team_members['Division'].dropna().unique()
-            division_count = len(divisions)
-            division_list = ', '.join(sorted(divisions)) if len(divisions) > 0 else 'Aucune'
-            
-            # Nombre de paires inviteur-invité
-            pairs = sum(1 for _, row in team_members.iterrows() if pd.notna(row['GuestId']))
-            
+        # Un seul groupby sur toutes les équipes au lieu d'un filtrage par équipe
+        groups = self.df.assign(_is_comp=self.is_comp_arr, _has_guest=self.has_guest_arr).groupby('Team', observed=True)
+        counts = groups.agg(
+            total_members=('Id', 'size'),
+            compagnons=('_is_comp', 'sum'),
+            division_count=('Division', 'nunique'),
+            pairs=('_has_guest', 'sum'),
+        ).reindex(team_names, fill_value=0)
+        division_lists = groups['Division'].agg(
+            lambda divisions: ', '.join(sorted(divisions.dropna().unique())) or 'Aucune'
+        ).reindex(team_names, fill_value='Aucune')
+        
+        return pd.DataFrame({
+            'Équipe': team_names,
+            'Nombre de membres': counts['total_members'].to_numpy(),
+            'Nombre de compagnons': counts['compagnons'].to_numpy(),
+            'Nombre de divisions': counts['division_count'].to_numpy(),
+            'Divisions': division_lists.to_numpy(),
+            'Nombre de paires inviteur-invité': counts['pairs'].to_numpy(),
             # Écart par rapport à la moyenne des paires
-            pairs_deviation = pairs - min_pairs_per_team
-            
-            stats.append({
-                'Équipe': team_name,
-                'Nombre de membres': total_members,
-                'Nombre de compagnons': compagnons,
-                'Nombre de divisions': division_count,
-                'Divisions': division_list,
-                'Nombre de paires inviteur-invité': pairs,
-                'Écart moyen paires': pairs_deviation
-            })
-            
-        return pd.DataFrame(stats)
+            'Écart moyen paires': counts['pairs'].to_numpy() - min_pairs_per_team
+        })
     
     def _validate_team_sizes(self) -> bool:
         """Vérifie que les tailles des équipes sont correctes."""
         team_sizes = self.df['Team'].value_counts()
+        team_sizes = team_sizes[team_sizes > 0]  # Catégories sans membre : équipes non créées
         
         # Vérifier le nombre d'équipes
         if len(team_sizes) != TOTAL_TEAMS:
@@ -135,7 +204,7 @@ class TeamAllocator:
         # Vérifier les tailles des équipes
         for team_name, size in team_sizes.items():
             team_num = int(team_name.split('_')[1])
-            expected_size = 8 if team_num <= TEAM_SIZE_8 else 7
+            expected_size = self._get_team_size_limit(team_num - 1)
             if size != expected_size:
                 print(f"Erreur : L'équipe {team_name} a {size} membres au lieu de {expected_size}")
                 return False
@@ -144,12 +213,12 @@ class TeamAllocator:
         
     def _validate_pairs(self) -> bool:
         """Vérifie que les paires inviteur-invité sont dans la même équipe."""
-        for inviter, guest in self.pairs:
-            inviter_team = self.df[self.df['Id'] == inviter]['Team'].iloc[0]
-            guest_team = self.df[self.df['Id'] == guest]['Team'].iloc[0]
-            if inviter_team != guest_team:
-                print(f"Erreur : La paire {inviter}-{guest} n'est pas dans la même équipe")
-                return False
+        teams_arr = self.df['Team'].to_numpy()
+        mismatches = np.flatnonzero(teams_arr[self.pair_inviter_idxs] != teams_arr[self.pair_guest_idxs])
+        if mismatches.size > 0:
+            inviter, guest = self.pairs[mismatches[0]]
+            print(f"Erreur : La paire {inviter}-{guest} n'est pas dans la même équipe")
+            return False
         return True
         
     def validate_allocation(self) -> bool:
@@ -172,8 +241,8 @@ class TeamAllocator:
 
     def allocate_teams(self) -> pd.DataFrame:
         """Alloue les personnes aux équipes en respectant les contraintes."""
-        teams = self._initialize_teams()
-        unassigned = set(self.df['Id'].values)
+        team_of = self._initialize_teams()
+        assigned = np.zeros(len(self.df), dtype=np.bool_)
         
         # Compter le nombre total de paires
         total_pairs = len(self.pairs)
@@ -181,93 +250,77 @@ class TeamAllocator:
         remaining_pairs = total_pairs % TOTAL_TEAMS      # Paires restantes à distribuer
         
         # Créer une liste des équipes avec leur quota de paires
-        team_pair_quotas = [min_pairs_per_team + (1 if i < remaining_pairs else 0) 
-                          for i in range(TOTAL_TEAMS)]
+        team_pair_quotas = np.array([min_pairs_per_team + (1 if i < remaining_pairs else 0)
+                                     for i in range(TOTAL_TEAMS)])
         
         # Trier les paires par division pour maximiser la diversité
-        sorted_pairs = []
-        for inviter, guest in self.pairs:
-            inviter_info = self.df[self.df['Id'] == inviter].iloc[0]
-            guest_info = self.df[self.df['Id'] == guest].iloc[0]
-            
-            # Calculer le score de diversité de la paire
-            division_score = 0
-            if pd.notna(inviter_info['Division']):
-                division_score += 1
-            if pd.notna(guest_info['Division']):
-                division_score += 1
-            
-            compagnon_score = 0
-            if inviter_info['IsCompagnons'] == 'OUI':
-                compagnon_score += 1
-            if guest_info['IsCompagnons'] == 'OUI':
-                compagnon_score += 1
-                
-            sorted_pairs.append((inviter, guest, division_score, compagnon_score))
+        inviter_idxs, guest_idxs = self.pair_inviter_idxs, self.pair_guest_idxs
         
-        # Trier les paires par leur potentiel de diversité
-        sorted_pairs.sort(key=lambda x: (-x[2], -x[3]))  # Trier par division puis compagnon, ordre décroissant
+        # Calculer le score de diversité des paires
+        has_division = self.division_codes >= 0
+        division_scores = has_division[inviter_idxs].astype(int) + has_division[guest_idxs].astype(int)
+        compagnon_scores = self.is_comp_arr[inviter_idxs].astype(int) + self.is_comp_arr[guest_idxs].astype(int)
+        
+        # Trier les paires par leur potentiel de diversité : division puis compagnon,
+        # ordre décroissant (lexsort est stable, comme list.sort)
+        order = np.lexsort((-compagnon_scores, -division_scores))
         
         # Traiter d'abord les paires inviteur-invité
-        for inviter, guest, _, _ in sorted_pairs:
-            if inviter in unassigned:
-                # Trouver la meilleure équipe pour la paire
-                best_team_idx = -1
-                best_score = float('-inf')
+        for pair_idx in order:
+            inviter_idx = inviter_idxs[pair_idx]
+            guest_idx = guest_idxs[pair_idx]
+            if not assigned[inviter_idx]:
+                # Trouver la meilleure équipe pour la paire (toutes les équipes scorées à la fois)
+                sizes, compagnons, current_pairs = self.team_sizes, self.team_compagnons, self.team_pairs
+                scores = self._calculate_team_diversity_scores(inviter_idx, sizes, compagnons, current_pairs)
+                # Score de l'invité avec l'inviteur déjà dans l'équipe
+                scores += self._calculate_team_diversity_scores(
+                    guest_idx, sizes + 1,
+                    compagnons + self.is_comp_arr[inviter_idx],
+                    current_pairs + self.has_guest_arr[inviter_idx],
+                    extra_division=self.division_codes[inviter_idx])
+                
+                # Facteur de quota : favoriser les équipes qui n'ont pas atteint leur quota
+                scores += np.where(current_pairs < team_pair_quotas, 3.0, 0.0)
                 
-                for team_idx, team in enumerate(teams):
-                    if len(team) + 2 <= self._get_team_size_limit(team_idx):
-                        # Calculer le score de base
-                        score = self._calculate_team_diversity_score(team, inviter)
-                        score += self._calculate_team_diversity_score(team + [inviter], guest)
-                        
-                        # Facteur de quota : favoriser les équipes qui n'ont pas atteint leur quota
-                        current_pairs = sum(1 for t_id in team if pd.notna(self.df[self.df['Id'] == t_id]['GuestId'].iloc[0]))
-                        if current_pairs < team_pair_quotas[team_idx]:
-                            score += 3.0  # Bonus important pour respecter les quotas
-                        
-                        # Facteur d'équilibrage : éviter les équipes qui ont déjà beaucoup de paires
-                        if current_pairs > team_pair_quotas[team_idx]:
-                            score -= 2.0 * (current_pairs - team_pair_quotas[team_idx])
-                        
-                        if score > best_score:
-                            best_score = score
-                            best_team_idx = team_idx
+                # Facteur d'équilibrage : éviter les équipes qui ont déjà beaucoup de paires
+                scores -= np.where(current_pairs > team_pair_quotas,
+                                   2.0 * (current_pairs - team_pair_quotas), 0.0)
+                
+                # argmax garde la première équipe en cas d'égalité
+                available = sizes + 2 <= self.size_limits
+                best_team_idx = int(np.argmax(np.where(available, scores, -np.inf))) if available.any() else -1
                 
                 if best_team_idx != -1:
-                    teams[best_team_idx].extend([inviter, guest])
-                    unassigned.remove(inviter)
-                    unassigned.remove(guest)
+                    self._add_to_team(team_of, best_team_idx, inviter_idx)
+                    self._add_to_team(team_of, best_team_idx, guest_idx)
+                    assigned[inviter_idx] = assigned[guest_idx] = True
         
         # Assigner le reste des personnes
-        remaining = list(unassigned)
-        random.shuffle(remaining)
+        # Positions non assignées mélangées : ordre indépendant du hachage des Id
+        remaining = np.flatnonzero(~assigned)
+        self.rng.shuffle(remaining)
         
-        for person_id in remaining:
-            best_team_idx = -1
-            best_score = float('-inf')
+        for person_idx in remaining:
+            sizes = self.team_sizes
+            scores = self._calculate_team_diversity_scores(
+                person_idx, sizes, self.team_compagnons, self.team_pairs)
+            
+            # Bonus pour équilibrer les tailles d'équipes
+            scores += 1.0 / (sizes + 1)
             
-            for team_idx, team in enumerate(teams):
-                if len(team) < self._get_team_size_limit(team_idx):
-                    score = self._calculate_team_diversity_score(team, person_id)
-                    
-                    # Bonus pour équilibrer les tailles d'équipes
-                    score += 1.0 / (len(team) + 1)
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_team_idx = team_idx
+            available = sizes < self.size_limits
+            best_team_idx = int(np.argmax(np.where(available, scores, -np.inf))) if available.any() else -1
             
-            teams[best_team_idx].append(person_id)
+            # Aucune place : la personne reste sans équipe (signalé par validate_allocation)
+            if best_team_idx != -1:
+                self._add_to_team(team_of, best_team_idx, person_idx)
+        
+        # Recherche locale : échanges de personnes seules tant qu'ils améliorent l'allocation
+        self._refine_swaps(team_of)
         
         # Mettre à jour le DataFrame avec les assignations
-        team_assignments = {}
-        for team_idx, team in enumerate(teams):
-            team_name = self._get_team_name(team_idx)
-            for person_id in team:
-                team_assignments[person_id] = team_name
-                
-        self.df['Team'] = self.df['Id'].map(team_assignments)
+        self.df['Team'] = pd.Categorical.from_codes(team_of, categories=self.team_names)
         return self.df
 
     def save_results(self, output_path: str = None, stats_path: str = None):